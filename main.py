@@ -3,37 +3,244 @@ Small-scale CPU-based document processing pipeline using Docling
 for extracting structured data from property valuation reports.
 """
 
+import os
+
+# Parallelism comes from the worker processes, so native thread pools get one
+# thread each. Set before Docling imports torch, whose OpenMP runtime reads
+# these once at load; spawned workers re-import this module and forked ones
+# inherit the environment, so both see them in time.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+
 from docling.document_converter import DocumentConverter, PdfFormatOption
-from docling.datamodel.base_models import InputFormat
+from docling.datamodel.base_models import DocumentStream, InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
 from docling.backend.pypdfium2_backend import PyPdfiumDocumentBackend
-import json
+from docling_core.types.doc import TableItem, TextItem
+import pypdfium2 as pdfium
+
+try:
+    # Overlaps page parsing, layout and table stages across page batches
+    from docling.datamodel.pipeline_options import ThreadedPdfPipelineOptions as _PdfPipelineOptions
+    from docling.pipeline.threaded_standard_pdf_pipeline import ThreadedStandardPdfPipeline as _PdfPipeline
+except ImportError:  # Docling releases without the threaded pipeline
+    from docling.pipeline.standard_pdf_pipeline import StandardPdfPipeline as _PdfPipeline
+    _PdfPipelineOptions = PdfPipelineOptions
+import orjson
+import csv
+import hashlib
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import re
-from datetime import datetime
+from datetime import datetime, timezone
+
+
+# Precompiled patterns (flags baked in so call sites only pass the text)
+_VALUER_COMPANY_RE = re.compile(r"(NW Realite|N'W Realite)", re.IGNORECASE)
+_REPORT_NUMBER_RE = re.compile(r"(\d{3,}/\w+/\d+/\d+/\d+)")
+_INSPECTION_DATE_RE = re.compile(r"(?:inspected|inspection)[^\n]{0,120}?(\d{1,2}\s+\w+\s+\d{4})", re.IGNORECASE)
+_LR_RE = re.compile(r"L\.?R\.?\s*(?:No\.?|Number)?\s*(\d+/\d+(?:-\d+)?)")
+_TENURE_RE = re.compile(r"(Leasehold|Freehold)[^\n]{0,120}?(\d+)\s*years", re.IGNORECASE)
+_OWNER_RE = re.compile(r"registered[^\n]{0,80}?name[^\n]{0,120}?([A-Z][A-Z\s&]{1,120}(?:MINISTRIES|LIMITED|LTD|INC))")
+_LAND_VALUE_RE = re.compile(r"Land[^\n]{0,200}?KShs?\.?\s*([\d,]+)")
+_DEV_VALUE_RE = re.compile(r"Developments[^\n]{0,200}?KShs?\.?\s*([\d,]+)")
+_CONDITION_RE = re.compile(r"(good|fair|poor)\s*condition", re.IGNORECASE)
+_COUNTY_RE = re.compile(r"(\w+)\s*County")
+_AREA_LOC_RE = re.compile(r"(Kikuyu|Ondiri|[\w\s]{1,120})\s*(?:Township|Area)")
+_COORDS_RE = re.compile(r"(\d+°\d+'[\d.]+\"[SN])\s*(\d+°\d+'[\d.]+\"[EW])")
+
+# Case-insensitive patterns that only capture digits run against the
+# casefolded text with lowercase literals instead of re.IGNORECASE
+_AREA_RE = re.compile(r"(\d+\.?\d*)\s*hectares[^\n]{0,80}?(\d+\.?\d*)\s*acres")
+_TITLE_RE = re.compile(r"(\d+/\d+)[^\n]{0,120}?leasehold[^\n]{0,120}?(\d+)\s*years[^\n]{0,200}?kshs?\.\s*([\d,]+)")
+_MARKET_VALUE_RE = re.compile(r"market\s*value[^\n]{0,200}?kshs?\.?\s*([\d,]+)")
+_BEDROOMS_RE = re.compile(r"(\d+)\s*(?:no\.|number)?\s*bedroom")
+_BUILTUP_RE = re.compile(r"(\d+,?\d*)\s*sq\.?\s*ft")
+_TOWNHOUSE_QTY_RE = re.compile(r"(\d+)\s*(?:no\.)[^\n]{0,80}?townhouse")
+
+_SECTION_HEADERS = [
+    "TERMS OF REFERENCE",
+    "LIMITING CONDITIONS",
+    "REPORT AND VALUATION",
+    "SITUATION",
+    "TITLE DETAILS",
+    "PLOT AREA",
+    "IMPROVEMENTS",
+    "CONDITION",
+    "GENERAL REMARKS",
+    "VALUATION"
+]
+# A header starts its line (optionally behind markdown "#"/"*" markers) and is
+# followed by a colon or the end of the line
+_SECTION_HEADERS_RE = re.compile(
+    rf"^[ \t#*]*(?P<h>{'|'.join(_SECTION_HEADERS)})[ \t*]*(?::|$)",
+    re.MULTILINE | re.IGNORECASE
+)
+
+# Single-shot fields, each resolved by its own search over the text
+_SCAN_FIELDS = [
+    ("valuer_company", _VALUER_COMPANY_RE),
+    ("report_number", _REPORT_NUMBER_RE),
+    ("inspection_date", _INSPECTION_DATE_RE),
+    ("tenure", _TENURE_RE),
+    ("owner", _OWNER_RE),
+    ("land_value", _LAND_VALUE_RE),
+    ("developments_value", _DEV_VALUE_RE),
+    ("coordinates", _COORDS_RE),
+    ("county", _COUNTY_RE),
+    ("location_area", _AREA_LOC_RE),
+]
+
+# Same, for the fields matched against the casefolded text
+_SCAN_LOWER_FIELDS = [
+    ("area", _AREA_RE),
+    ("market_value", _MARKET_VALUE_RE),
+]
+
+# Literals a field cannot match without; a field whose literals are absent
+# from the text is skipped without running its pattern
+_SCAN_LITERALS = {
+    "owner": ("registered", "name"),
+    "land_value": ("Land", "KSh"),
+    "developments_value": ("Developments", "KSh"),
+    "coordinates": ("°",),
+    "county": ("County",),
+}
+_SCAN_LOWER_LITERALS = {
+    "area": ("hectares", "acres"),
+    "market_value": ("market", "ksh"),
+}
+_TITLE_LITERALS = ("leasehold", "years", "ksh")
+
+# Integer range orjson can serialize
+_JSON_INT_MIN = -(1 << 63)
+_JSON_INT_MAX = (1 << 64) - 1
+
+
+def _stringify_big_ints(value: Any) -> Any:
+    """Copy containers, turning integers outside orjson's 64-bit range into strings."""
+    if isinstance(value, dict):
+        return {key: _stringify_big_ints(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_stringify_big_ints(item) for item in value]
+    if isinstance(value, int) and not isinstance(value, bool) and not _JSON_INT_MIN <= value <= _JSON_INT_MAX:
+        return str(value)
+    return value
+
+
+def _json_bytes(data: Any, option: Optional[int] = None) -> bytes:
+    """Serialize with orjson; amounts too large for 64 bits are stored as strings."""
+    try:
+        return orjson.dumps(data, option=option, default=str)
+    except orjson.JSONEncodeError:
+        # Rare, so only then pay for a copy of the data
+        return orjson.dumps(_stringify_big_ints(data), option=option, default=str)
 
 
 class PropertyValuationExtractor:
     """Extract structured data from property valuation reports."""
     
-    def __init__(self):
-        # Configure Docling for CPU-only processing
-        pipeline_options = PdfPipelineOptions()
-        pipeline_options.do_ocr = True  # Enable OCR for scanned documents
-        pipeline_options.do_table_structure = True  # Extract tables
+    def __init__(self, enable_ocr: bool = False, ocr_bitmap_threshold: float = 0.05,
+                 extract_tables: bool = True, include_raw_tables: bool = False,
+                 num_threads: Optional[int] = None, extraction_date: Optional[str] = None):
+        """
+        Args:
+            enable_ocr: Force OCR on every document. When False, OCR is only
+                used for PDFs with a page that has no text layer.
+            ocr_bitmap_threshold: Minimum share of a page covered by bitmaps
+                before OCR runs on it
+            extract_tables: Run TableFormer table structure recognition
+            include_raw_tables: Keep each table's string form as raw_content
+            num_threads: Threads per Docling model (None keeps Docling's default)
+            extraction_date: ISO timestamp stamped on every extraction; defaults
+                to when the extractor is built, so a batch shares one date
+        """
+        self.enable_ocr = enable_ocr
+        self.ocr_bitmap_threshold = ocr_bitmap_threshold
+        self.extract_tables = extract_tables
+        self.include_raw_tables = include_raw_tables
+        self.num_threads = num_threads
+        self._batch_ts = extraction_date or datetime.now(timezone.utc).isoformat()
+        
+        self.converter = self._build_converter(do_ocr=enable_ocr)
+        self._warm_up(self.converter)
+        # OCR converter for scanned PDFs, built on first need
+        self._ocr_converter = self.converter if enable_ocr else None
+    
+    def _build_converter(self, do_ocr: bool) -> DocumentConverter:
+        """Build a CPU-only Docling converter, with or without OCR."""
+        pipeline_options = _PdfPipelineOptions()
+        pipeline_options.do_ocr = do_ocr  # OCR is the most expensive stage; skip it for digital PDFs
+        if hasattr(pipeline_options.ocr_options, "bitmap_area_threshold"):
+            pipeline_options.ocr_options.bitmap_area_threshold = self.ocr_bitmap_threshold
+        pipeline_options.do_table_structure = self.extract_tables  # Extract tables
         pipeline_options.table_structure_options.mode = TableFormerMode.FAST  # CPU-optimized
+        pipeline_options.table_structure_options.do_cell_matching = False  # Only cell text is used
+        if self.num_threads is not None:
+            pipeline_options.accelerator_options.num_threads = self.num_threads  # Threads per model
         
         # Initialize converter with CPU backend
-        self.converter = DocumentConverter(
+        return DocumentConverter(
             format_options={
                 InputFormat.PDF: PdfFormatOption(
+                    pipeline_cls=_PdfPipeline,
                     pipeline_options=pipeline_options,
                     backend=PyPdfiumDocumentBackend  # CPU-based PDF backend
                 )
             }
         )
     
+    def _converter_for(self, pdf_path: str, start: int = 0, stop: Optional[int] = None) -> DocumentConverter:
+        """Pick the OCR converter only for PDFs with a page in [start, stop) lacking a text layer."""
+        if self.enable_ocr or self._has_text_layer(pdf_path, start, stop):
+            return self.converter
+        if self._ocr_converter is None:
+            self._ocr_converter = self._build_converter(do_ocr=True)
+            self._warm_up(self._ocr_converter)
+        return self._ocr_converter
+    
+    @staticmethod
+    def _warm_up(converter: DocumentConverter):
+        """Convert a blank one-page PDF so model loading happens before real documents."""
+        pdf = pdfium.PdfDocument.new()
+        pdf.new_page(595, 842)  # A4 in points
+        buffer = BytesIO()
+        pdf.save(buffer)
+        pdf.close()
+        buffer.seek(0)
+        converter.convert(DocumentStream(name="warmup.pdf", stream=buffer), raises_on_error=False)
+    
+    @staticmethod
+    def _has_text_layer(pdf_path: str, start: int = 0, stop: Optional[int] = None) -> bool:
+        """Check whether every page in [start, stop) has extractable text.
+        
+        Scanned pages inside otherwise digital PDFs send the whole document to
+        the OCR converter, whose bitmap threshold then limits OCR to them.
+        """
+        try:
+            pdf = pdfium.PdfDocument(pdf_path)
+        except pdfium.PdfiumError:
+            return False  # Let Docling report the unreadable file
+        try:
+            page_indices = range(len(pdf))[start:stop]
+            if not page_indices:
+                return False
+            for index in page_indices:
+                page = pdf[index]
+                textpage = page.get_textpage()
+                try:
+                    if not textpage.get_text_range().strip():
+                        return False
+                finally:
+                    textpage.close()
+                    page.close()
+            return True
+        finally:
+            pdf.close()
+    
     def process_document(self, pdf_path: str) -> Dict[str, Any]:
         """
         Process PDF and extract structured data.
@@ -45,83 +252,160 @@ class PropertyValuationExtractor:
             Structured dictionary with extracted data
         """
         # Convert document
-        result = self.converter.convert(pdf_path)
+        result = self._converter_for(pdf_path).convert(pdf_path)
+        return self._extract_structured_data([self._document_parts(result)])
+    
+    def convert_pages(self, pdf_path: str, start: int, stop: int) -> Tuple[str, int, List[Dict[str, Any]]]:
+        """
+        Convert one page range of a PDF on its own, for splitting long documents.
         
-        # Extract text content
-        full_text = result.document.export_to_markdown()
+        Args:
+            pdf_path: Path to the PDF file
+            start: First page index (0-based, inclusive)
+            stop: Last page index (0-based, exclusive)
+            
+        Returns:
+            (text, page count, tables) for the range, to be passed to extract_pages
+        """
+        # Copy the range into a sub-PDF in memory
+        pdf = pdfium.PdfDocument(pdf_path)
+        part = pdfium.PdfDocument.new()
+        try:
+            part.import_pages(pdf, list(range(start, stop)))
+            buffer = BytesIO()
+            part.save(buffer)
+        finally:
+            part.close()
+            pdf.close()
+        buffer.seek(0)
+        
+        name = f"{Path(pdf_path).stem}_pages_{start + 1}-{stop}.pdf"
+        result = self._converter_for(pdf_path, start, stop).convert(DocumentStream(name=name, stream=buffer))
+        return self._document_parts(result, page_offset=start)
+    
+    def extract_pages(self, parts: List[Tuple[str, int, List[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """
+        Extract structured data from page-range conversions of one PDF.
+        
+        Args:
+            parts: convert_pages outputs, in page order
+            
+        Returns:
+            Structured dictionary with extracted data
+        """
+        return self._extract_structured_data(parts)
+    
+    def _document_parts(self, result, page_offset: int = 0) -> Tuple[str, int, List[Dict[str, Any]]]:
+        """Reduce a conversion result to its text, page count and tables."""
+        tables = (
+            self._extract_tables(result, include_raw=self.include_raw_tables, page_offset=page_offset)
+            if self.extract_tables else []
+        )
+        return self._document_text(result.document), len(result.document.pages), tables
+    
+    def _extract_structured_data(self, parts: List[Tuple[str, int, List[Dict[str, Any]]]]) -> Dict[str, Any]:
+        """Extract structured data from converted document parts, in page order."""
+        # Stitch text content
+        full_text = "\n".join(text for text, _, _ in parts)
+        full_text_lower = full_text.casefold()
+        fields = self._scan_all(full_text, full_text_lower)
+        page_count = sum(count for _, count, _ in parts)
         
         # Extract structured data
         structured_data = {
-            "metadata": self._extract_metadata(result, full_text),
-            "property_details": self._extract_property_details(full_text),
-            "title_information": self._extract_title_info(full_text),
-            "valuation": self._extract_valuation(full_text),
-            "improvements": self._extract_improvements(full_text),
-            "location": self._extract_location(full_text),
-            "tables": self._extract_tables(result),
+            "metadata": self._extract_metadata(page_count, fields),
+            "property_details": self._extract_property_details(full_text, fields),
+            "title_information": self._extract_title_info(full_text_lower),
+            "valuation": self._extract_valuation(fields),
+            "improvements": self._extract_improvements(full_text, full_text_lower),
+            "location": self._extract_location(fields),
+            "tables": [table for _, _, tables in parts for table in tables],
             "raw_sections": self._extract_sections(full_text)
         }
         
         return structured_data
     
-    def _extract_metadata(self, result, text: str) -> Dict[str, Any]:
+    def _document_text(self, document) -> str:
+        """Join text items and table rows in reading order, one per line."""
+        lines = []
+        for item, _ in document.iterate_items():
+            if isinstance(item, TextItem):
+                lines.append(item.text)
+            elif isinstance(item, TableItem):
+                # Keep each row on one line so labels stay next to their values
+                lines.extend(" | ".join(cell.text for cell in row) for row in item.data.grid)
+        return "\n".join(lines)
+    
+    def _scan_all(self, text: str, text_lower: str) -> Dict[str, tuple]:
+        """Map each single-shot field to the groups of its first match."""
+        fields = {}
+        for scan_fields, literals, source in (
+            (_SCAN_FIELDS, _SCAN_LITERALS, text),
+            (_SCAN_LOWER_FIELDS, _SCAN_LOWER_LITERALS, text_lower)
+        ):
+            for name, pattern in scan_fields:
+                if not all(literal in source for literal in literals.get(name, ())):
+                    continue
+                match = pattern.search(source)
+                if match:
+                    fields[name] = match.groups()
+        return fields
+    
+    def _extract_metadata(self, page_count: int, fields: Dict[str, tuple]) -> Dict[str, Any]:
         """Extract document metadata."""
         metadata = {
             "document_type": "Property Valuation Report",
-            "extraction_date": datetime.now().isoformat(),
-            "page_count": len(result.document.pages),
-            "valuer_company": self._find_pattern(text, r"(NW Realite|N'W Realite)"),
-            "report_number": self._find_pattern(text, r"(\d{3,}/\w+/\d+/\d+/\d+)")
+            "extraction_date": self._batch_ts,
+            "page_count": page_count,
+            "valuer_company": fields["valuer_company"][0] if "valuer_company" in fields else None,
+            "report_number": fields["report_number"][0] if "report_number" in fields else None
         }
         
         # Extract inspection date
-        date_match = re.search(r"(?:inspected|inspection).*?(\d{1,2}\s+\w+\s+\d{4})", text, re.IGNORECASE)
-        if date_match:
-            metadata["inspection_date"] = date_match.group(1)
+        if "inspection_date" in fields:
+            metadata["inspection_date"] = fields["inspection_date"][0]
         
         return metadata
     
-    def _extract_property_details(self, text: str) -> Dict[str, Any]:
+    def _extract_property_details(self, text: str, fields: Dict[str, tuple]) -> Dict[str, Any]:
         """Extract core property details."""
         details = {}
         
         # Property reference
-        lr_numbers = re.findall(r"L\.?R\.?\s*(?:No\.?|Number)?\s*(\d+/\d+(?:-\d+)?)", text)
+        lr_numbers = list(dict.fromkeys(match.group(1) for match in _LR_RE.finditer(text)))
         if lr_numbers:
-            details["lr_numbers"] = list(set(lr_numbers))
+            details["lr_numbers"] = lr_numbers
         
         # Area measurements
-        area_match = re.search(r"(\d+\.?\d*)\s*hectares.*?(\d+\.?\d*)\s*acres", text, re.IGNORECASE)
-        if area_match:
+        if "area" in fields:
+            hectares, acres = fields["area"]
             details["area"] = {
-                "hectares": float(area_match.group(1)),
-                "acres": float(area_match.group(2))
+                "hectares": float(hectares),
+                "acres": float(acres)
             }
         
         # Tenure
-        tenure_match = re.search(r"(Leasehold|Freehold).*?(\d+)\s*years", text, re.IGNORECASE)
-        if tenure_match:
+        if "tenure" in fields:
+            tenure_type, term_years = fields["tenure"]
             details["tenure"] = {
-                "type": tenure_match.group(1),
-                "term_years": int(tenure_match.group(2))
+                "type": tenure_type,
+                "term_years": int(term_years)
             }
         
         # Owner
-        owner_match = re.search(r"registered.*?name.*?([A-Z][A-Z\s&]+(?:MINISTRIES|LIMITED|LTD|INC))", text)
-        if owner_match:
-            details["registered_owner"] = owner_match.group(1).strip()
+        if "owner" in fields:
+            details["registered_owner"] = fields["owner"][0].strip()
         
         return details
     
-    def _extract_title_info(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_title_info(self, text_lower: str) -> List[Dict[str, Any]]:
         """Extract individual title information."""
         titles = []
         
         # Look for title tables or structured title info
-        title_pattern = r"(\d+/\d+).*?Leasehold.*?(\d+)\s*years.*?KShs?\.\s*([\d,]+)"
-        matches = re.finditer(title_pattern, text, re.IGNORECASE)
-        
-        for match in matches:
+        if not all(literal in text_lower for literal in _TITLE_LITERALS):
+            return titles
+        for match in _TITLE_RE.finditer(text_lower):
             titles.append({
                 "lr_number": match.group(1),
                 "tenure_years": int(match.group(2)),
@@ -130,27 +414,30 @@ class PropertyValuationExtractor:
         
         return titles
     
-    def _extract_valuation(self, text: str) -> Dict[str, Any]:
+    def _extract_valuation(self, fields: Dict[str, tuple]) -> Dict[str, Any]:
         """Extract valuation figures."""
         valuation = {}
         
         # Current market value
-        market_value = re.search(r"Market\s*Value.*?KShs?\.?\s*([\d,]+)", text, re.IGNORECASE)
-        if market_value:
-            valuation["current_market_value"] = int(market_value.group(1).replace(",", ""))
+        if "market_value" in fields:
+            valuation["current_market_value"] = self._parse_amount(fields["market_value"][0])
         
         # Breakdown
-        land_value = re.search(r"Land.*?KShs?\.?\s*([\d,]+)", text)
-        if land_value:
-            valuation["land_value"] = int(land_value.group(1).replace(",", ""))
+        if "land_value" in fields:
+            valuation["land_value"] = self._parse_amount(fields["land_value"][0])
         
-        developments_value = re.search(r"Developments.*?KShs?\.?\s*([\d,]+)", text)
-        if developments_value:
-            valuation["developments_value"] = int(developments_value.group(1).replace(",", ""))
+        if "developments_value" in fields:
+            valuation["developments_value"] = self._parse_amount(fields["developments_value"][0])
         
         return valuation
     
-    def _extract_improvements(self, text: str) -> Dict[str, Any]:
+    @staticmethod
+    def _parse_amount(value: str) -> Optional[int]:
+        """Parse a comma-grouped amount; a capture of only commas gives None."""
+        digits = value.replace(",", "")
+        return int(digits) if digits.isdigit() else None
+    
+    def _extract_improvements(self, text: str, text_lower: str) -> Dict[str, Any]:
         """Extract building and improvement details."""
         improvements = {
             "buildings": [],
@@ -158,47 +445,50 @@ class PropertyValuationExtractor:
         }
         
         # Look for building descriptions
-        if "townhouse" in text.lower():
+        if "townhouse" in text_lower:
             # Extract townhouse details
-            bedrooms = re.search(r"(\d+)\s*(?:No\.|Number)?\s*bedroom", text, re.IGNORECASE)
-            built_up = re.search(r"(\d+,?\d*)\s*sq\.?\s*ft", text, re.IGNORECASE)
+            bedrooms = _BEDROOMS_RE.search(text_lower)
+            built_up = _BUILTUP_RE.search(text_lower)
             
             improvements["buildings"].append({
                 "type": "Townhouse",
-                "quantity": self._find_pattern(text, r"(\d+)\s*(?:No\.).*?[Tt]ownhouse", default="2"),
+                "quantity": self._find(_TOWNHOUSE_QTY_RE, text_lower, default="2"),
                 "bedrooms": bedrooms.group(1) if bedrooms else None,
                 "built_up_area_sqft": built_up.group(1).replace(",", "") if built_up else None,
-                "condition": self._find_pattern(text, r"(good|fair|poor)\s*condition", default="Not specified")
+                "condition": self._find(_CONDITION_RE, text, default="Not specified")
             })
         
         return improvements
     
-    def _extract_location(self, text: str) -> Dict[str, Any]:
+    def _extract_location(self, fields: Dict[str, tuple]) -> Dict[str, Any]:
         """Extract location information."""
         location = {}
         
         # County and area
-        county_match = re.search(r"(\w+)\s*County", text)
-        if county_match:
-            location["county"] = county_match.group(1)
+        if "county" in fields:
+            location["county"] = fields["county"][0]
         
         # Township/area
-        area_match = re.search(r"(Kikuyu|Ondiri|[\w\s]+)\s*(?:Township|Area)", text)
-        if area_match:
-            location["area"] = area_match.group(1).strip()
+        if "location_area" in fields:
+            location["area"] = fields["location_area"][0].strip()
         
         # GPS coordinates
-        coords_match = re.search(r"(\d+°\d+'[\d.]+\"[SN])\s*(\d+°\d+'[\d.]+\"[EW])", text)
-        if coords_match:
+        if "coordinates" in fields:
+            latitude, longitude = fields["coordinates"]
             location["coordinates"] = {
-                "latitude": coords_match.group(1),
-                "longitude": coords_match.group(2)
+                "latitude": latitude,
+                "longitude": longitude
             }
         
         return location
     
-    def _extract_tables(self, result) -> List[Dict[str, Any]]:
-        """Extract tables from document, safely skipping non-page entries."""
+    def _extract_tables(self, result, include_raw: bool = False, page_offset: int = 0) -> List[Dict[str, Any]]:
+        """Extract tables from document, safely skipping non-page entries.
+        
+        str(table) can render a large representation, so raw_content is only
+        included when include_raw is set. page_offset shifts page numbers for
+        results converted from a page range.
+        """
         tables = []
 
         for page in result.document.pages:
@@ -212,19 +502,18 @@ class PropertyValuationExtractor:
 
             for table in page.tables:
 
+                page_no = getattr(page, "page_no", None)
                 table_data = {
-                    "page": getattr(page, "page_no", None),
+                    "page": page_no + page_offset if page_no is not None else None,
                     "headers": [],
-                    "rows": [],
-                    "raw_content": str(table)
+                    "rows": []
                 }
+                if include_raw:
+                    table_data["raw_content"] = str(table)
 
                 # If table supports structured cells, extract them
                 if hasattr(table, "cells"):
-                    rows = []
-                    for row in table.cells:
-                        rows.append([cell.text for cell in row])
-                    table_data["rows"] = rows
+                    table_data["rows"] = [[cell.text for cell in row] for row in table.cells]
 
                 tables.append(table_data)
 
@@ -235,92 +524,287 @@ class PropertyValuationExtractor:
         """Extract major document sections."""
         sections = {}
         
-        # Define section patterns
-        section_patterns = [
-            "TERMS OF REFERENCE",
-            "LIMITING CONDITIONS",
-            "REPORT AND VALUATION",
-            "SITUATION",
-            "TITLE DETAILS",
-            "PLOT AREA",
-            "IMPROVEMENTS",
-            "CONDITION",
-            "GENERAL REMARKS",
-            "VALUATION"
-        ]
-        
-        for section in section_patterns:
-            pattern = f"{section}:?(.*?)(?={'|'.join(section_patterns)}|$)"
-            match = re.search(pattern, text, re.IGNORECASE | re.DOTALL)
-            if match:
-                sections[section.lower().replace(" ", "_")] = match.group(1).strip()[:500]  # Limit length
+        # Each body runs from the end of its header to the start of the next one
+        headers = list(_SECTION_HEADERS_RE.finditer(text))
+        for match, next_match in zip(headers, headers[1:] + [None]):
+            key = match.group("h").lower().replace(" ", "_")
+            if key in sections:
+                continue
+            end = next_match.start() if next_match else len(text)
+            sections[key] = text[match.end():end].strip()[:500]  # Limit length
         
         return sections
     
-    def _find_pattern(self, text: str, pattern: str, default: str = None) -> str:
-        """Helper to find regex pattern."""
-        match = re.search(pattern, text, re.IGNORECASE)
+    def _find(self, pattern: re.Pattern, text: str, default: str = None) -> str:
+        """Helper to return the first group of a precompiled pattern."""
+        match = pattern.search(text)
         return match.group(1) if match else default
     
     def save_json(self, data: Dict[str, Any], output_path: str):
         """Save extracted data to JSON file."""
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # orjson writes UTF-8 bytes directly; default=str covers stray datetimes
+        with open(output_path, 'wb') as f:
+            f.write(_json_bytes(data, option=orjson.OPT_INDENT_2))
         print(f"Data saved to {output_path}")
 
 
+# Extractor owned by each worker process, built once by _init_worker
+_worker_extractor = None
+
+# Columns of the batch summary CSV, in the order _process_pdf reports them
+SUMMARY_COLUMNS = [
+    "source_file", "output_file", "lr_numbers", "registered_owner",
+    "current_market_value", "area", "county", "page_count", "inspection_date",
+]
+COLUMN_INDEX = {name: i for i, name in enumerate(SUMMARY_COLUMNS)}
+_ROW_TEMPLATE = [""] * len(SUMMARY_COLUMNS)
+# Summary rows are buffered and written once this many pile up or this many
+# seconds have passed, so the CSV keeps up with a run without a write per PDF
+CSV_BATCH_ROWS = 100
+CSV_FLUSH_SECONDS = 30
+# PDFs longer than this many pages are converted in ranges of this size in parallel
+PAGE_CHUNK_SIZE = 8
+# Summaries of earlier runs keyed by PDF content digest, kept in the data directory
+CACHE_FILE_NAME = "extraction_cache.json"
+# Bump whenever a change to extraction alters its output, so cached summaries are rebuilt
+EXTRACTOR_VERSION = 1
+# Extractor options used by the workers; a cache written under other options is discarded
+EXTRACTOR_OPTIONS = {
+    "enable_ocr": False,
+    "ocr_bitmap_threshold": 0.05,
+    "extract_tables": True,
+    "include_raw_tables": False,
+}
+
+
+def _summary_row(summary: Dict[str, Any]) -> List[Any]:
+    """Project a summary dict onto the fixed SUMMARY_COLUMNS order."""
+    row = _ROW_TEMPLATE.copy()
+    for name, value in summary.items():
+        row[COLUMN_INDEX[name]] = value
+    if isinstance(summary["lr_numbers"], list):
+        row[COLUMN_INDEX["lr_numbers"]] = "; ".join(summary["lr_numbers"])
+    return row
+
+
+def _init_worker(extraction_date: str):
+    """Build this worker's single-threaded extractor."""
+    global _worker_extractor
+    _worker_extractor = PropertyValuationExtractor(
+        num_threads=1, extraction_date=extraction_date, **EXTRACTOR_OPTIONS
+    )
+
+
+def _file_digest(pdf_path: str) -> str:
+    """Hash a file's contents in 64 KB blocks."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(pdf_path, 'rb') as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _page_count(pdf_path: str) -> int:
+    """Count pages without converting; unreadable files count as zero."""
+    try:
+        pdf = pdfium.PdfDocument(pdf_path)
+    except pdfium.PdfiumError:
+        return 0  # Let the worker report the unreadable file
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _process_pdf(pdf_path: str) -> Dict[str, Any]:
+    """Extract one PDF in a worker, save its JSON next to it and return a summary."""
+    return _save_and_summarize(pdf_path, _worker_extractor.process_document(pdf_path))
+
+
+def _convert_chunk(pdf_path: str, start: int, stop: int) -> Tuple[str, int, List[Dict[str, Any]]]:
+    """Convert one page range of a long PDF in a worker."""
+    return _worker_extractor.convert_pages(pdf_path, start, stop)
+
+
+def _extract_chunks(pdf_path: str, parts: List[Tuple[str, int, List[Dict[str, Any]]]]) -> Dict[str, Any]:
+    """Extract a long PDF from its converted page ranges, save its JSON and return a summary."""
+    return _save_and_summarize(pdf_path, _worker_extractor.extract_pages(parts))
+
+
+def _save_and_summarize(pdf_path: str, structured_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Save structured data next to its PDF and return the summary row."""
+    pdf_path = Path(pdf_path)
+    
+    # Write in the worker so only the small summary travels back to the parent
+    output_path = pdf_path.with_name(f"{pdf_path.stem}_extracted.json")
+    _worker_extractor.save_json(structured_data, str(output_path))
+    
+    return {
+        "source_file": pdf_path.name,
+        "output_file": output_path.name,
+        "lr_numbers": structured_data["property_details"].get("lr_numbers", "N/A"),
+        "registered_owner": structured_data["property_details"].get("registered_owner", "N/A"),
+        "current_market_value": structured_data["valuation"].get("current_market_value"),
+        "area": structured_data["location"].get("area", "N/A"),
+        "county": structured_data["location"].get("county", "N/A"),
+        "page_count": structured_data["metadata"].get("page_count", "N/A"),
+        "inspection_date": structured_data["metadata"].get("inspection_date", "N/A")
+    }
+
+
 def main():
-    """Example usage - processes first PDF found in data directory."""
+    """Example usage - processes every PDF found in data directory in parallel."""
     
     # Path to data directory
     data_dir = Path(r"C:\Users\samue\Documents\Work\Code\valuation_data_miner\data")
     
-    # Find first PDF in directory
-    pdf_files = list(data_dir.glob("*.pdf"))
+    # Find PDFs in directory; scandir entries carry their type, so no extra stat per file
+    with os.scandir(data_dir) as entries:
+        pdf_files = sorted(
+            entry.path for entry in entries
+            if entry.is_file() and entry.name.lower().endswith(".pdf")
+        )
     
     if not pdf_files:
         print(f"No PDF files found in {data_dir}")
         return
     
-    pdf_path = pdf_files[0]
+    # Unchanged PDFs whose JSON is still on disk reuse the summary from their last run,
+    # as long as that run used the same extractor version and options
+    cache_path = data_dir / CACHE_FILE_NAME
+    settings = {"version": EXTRACTOR_VERSION, "page_chunk_size": PAGE_CHUNK_SIZE, **EXTRACTOR_OPTIONS}
+    previous_cache = orjson.loads(cache_path.read_bytes()) if cache_path.exists() else {}
+    if previous_cache.get("settings") != settings:
+        previous_cache = {}
+    previous_summaries = previous_cache.get("summaries", {})
+    cache = {}
+    digests = {}
+    cached_rows = []
+    to_process = []
+    for pdf_path in pdf_files:
+        digest = digests[pdf_path] = _file_digest(pdf_path)
+        summary = previous_summaries.get(digest)
+        output_name = f"{Path(pdf_path).stem}_extracted.json"
+        if summary is not None and os.path.exists(os.path.join(os.path.dirname(pdf_path), output_name)):
+            cache[digest] = summary
+            cached_rows.append(_summary_row(
+                {**summary, "source_file": os.path.basename(pdf_path), "output_file": output_name}
+            ))
+        else:
+            to_process.append(pdf_path)
+    
+    # Long PDFs are converted in page ranges on separate workers, then extracted once
+    chunk_ranges = {}
+    for pdf_path in to_process:
+        page_count = _page_count(pdf_path)
+        if page_count > PAGE_CHUNK_SIZE:
+            chunk_ranges[pdf_path] = [
+                (start, min(start + PAGE_CHUNK_SIZE, page_count))
+                for start in range(0, page_count, PAGE_CHUNK_SIZE)
+            ]
+    work_items = len(to_process) - len(chunk_ranges) + sum(map(len, chunk_ranges.values()))
+    
+    # Each worker loads its own Docling models; half the cores leaves room for them
+    max_workers = max(1, min(work_items, (os.cpu_count() or 2) // 2))
     print(f"Found {len(pdf_files)} PDF file(s) in directory")
-    print(f"Processing: {pdf_path.name}\n")
+    if cached_rows:
+        print(f"Reusing {len(cached_rows)} unchanged PDF file(s) from {CACHE_FILE_NAME}")
+    print(f"Processing with {max_workers} worker(s)\n")
     
-    # Initialize extractor
-    extractor = PropertyValuationExtractor()
+    # Summary rows go out in fixed-size batches so nothing piles up in memory
+    summary_path = data_dir / "extraction_summary.csv"
+    # Every worker stamps the same extraction date on this run's output
+    extraction_date = datetime.now(timezone.utc).isoformat()
     
+    failed = 0
     try:
-        structured_data = extractor.process_document(str(pdf_path))
-        
-        # Save to JSON in same directory
-        output_path = data_dir / f"{pdf_path.stem}_extracted.json"
-        extractor.save_json(structured_data, str(output_path))
-        
-        # Print summary
-        print("\n" + "="*60)
-        print("EXTRACTION SUMMARY")
-        print("="*60)
-        print(f"Source File: {pdf_path.name}")
-        print(f"Output File: {output_path.name}")
-        print(f"\nProperty LR Numbers: {structured_data['property_details'].get('lr_numbers', 'N/A')}")
-        print(f"Registered Owner: {structured_data['property_details'].get('registered_owner', 'N/A')}")
-        
-        if 'current_market_value' in structured_data['valuation']:
-            val = structured_data['valuation']['current_market_value']
-            print(f"Current Market Value: KShs {val:,}")
-        else:
-            print("Current Market Value: Not found")
-        
-        print(f"Location: {structured_data['location'].get('area', 'N/A')}, {structured_data['location'].get('county', 'N/A')}")
-        print(f"Page Count: {structured_data['metadata'].get('page_count', 'N/A')}")
-        print(f"Inspection Date: {structured_data['metadata'].get('inspection_date', 'N/A')}")
-        print("="*60)
-        
-    except Exception as e:
-        print(f"\n Error processing document: {e}")
-        import traceback
-        traceback.print_exc()
-        raise
+        with open(summary_path, 'w', newline='', encoding='utf-8') as summary_file, \
+                ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                    initargs=(extraction_date,)) as executor:
+            writer = csv.writer(summary_file)
+            writer.writerow(SUMMARY_COLUMNS)
+            writer.writerows(cached_rows)
+            summary_file.flush()
+            batch = []
+            last_flush = time.monotonic()
+        
+            # Each future maps to its PDF and, for page ranges, the range's position
+            futures = {}
+            chunk_parts = {}
+            for pdf_path in to_process:
+                if pdf_path in chunk_ranges:
+                    chunk_parts[pdf_path] = [None] * len(chunk_ranges[pdf_path])
+                    for index, (start, stop) in enumerate(chunk_ranges[pdf_path]):
+                        futures[executor.submit(_convert_chunk, pdf_path, start, stop)] = (pdf_path, index)
+                else:
+                    futures[executor.submit(_process_pdf, pdf_path)] = (pdf_path, None)
+        
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pdf_path, index = futures.pop(future)
+                    try:
+                        outcome = future.result()
+                    except Exception as e:
+                        if index is not None and chunk_parts.pop(pdf_path, None) is None:
+                            continue  # Another range of this PDF already failed
+                        failed += 1
+                        print(f"\n Error processing {os.path.basename(pdf_path)}: {e}")
+                        import traceback
+                        traceback.print_exc()
+                        continue
+                
+                    if index is not None:
+                        parts = chunk_parts.get(pdf_path)
+                        if parts is None:
+                            continue  # Another range of this PDF already failed
+                        parts[index] = outcome
+                        if all(part is not None for part in parts):
+                            # Every range converted; stitch them in page order and extract
+                            del chunk_parts[pdf_path]
+                            future = executor.submit(_extract_chunks, pdf_path, parts)
+                            futures[future] = (pdf_path, None)
+                            pending.add(future)
+                        continue
+                
+                    summary = outcome
+                    cache[digests[pdf_path]] = summary
+                    batch.append(_summary_row(summary))
+                    if len(batch) >= CSV_BATCH_ROWS or time.monotonic() - last_flush >= CSV_FLUSH_SECONDS:
+                        writer.writerows(batch)
+                        summary_file.flush()
+                        batch.clear()
+                        last_flush = time.monotonic()
+                
+                    # Print summary
+                    print("\n" + "="*60)
+                    print("EXTRACTION SUMMARY")
+                    print("="*60)
+                    print(f"Source File: {summary['source_file']}")
+                    print(f"Output File: {summary['output_file']}")
+                    print(f"\nProperty LR Numbers: {summary['lr_numbers']}")
+                    print(f"Registered Owner: {summary['registered_owner']}")
+                
+                    if summary['current_market_value'] is not None:
+                        print(f"Current Market Value: KShs {summary['current_market_value']:,}")
+                    else:
+                        print("Current Market Value: Not found")
+                
+                    print(f"Location: {summary['area']}, {summary['county']}")
+                    print(f"Page Count: {summary['page_count']}")
+                    print(f"Inspection Date: {summary['inspection_date']}")
+                    print("="*60)
+        
+            if batch:
+                writer.writerows(batch)
+    finally:
+        # Saved even when the run is interrupted, so PDFs finished so far are not
+        # converted again; only PDFs still in the directory are kept in the cache
+        cache_path.write_bytes(_json_bytes({"settings": settings, "summaries": cache}))
+    
+    print(f"\nProcessed {len(pdf_files) - failed}/{len(pdf_files)} PDF file(s)")
+    print(f"Summary saved to {summary_path}")
 
 
 if __name__ == "__main__":